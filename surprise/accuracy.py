@@ -45,9 +45,9 @@ def rmse(predictions, verbose=True):
     if not predictions:
         raise ValueError('Prediction list is empty.')
 
-    mse = np.mean([float((true_r - est)**2)
-                   for (_, _, true_r, est, _) in predictions])
-    rmse_ = np.sqrt(mse)
+    errors = np.array([true_r - est
+                       for (_, _, true_r, est, _) in predictions])
+    rmse_ = np.sqrt(np.mean(errors**2))
 
     if verbose:
         print('RMSE: {0:1.4f}'.format(rmse_))
@@ -80,8 +80,9 @@ def mse(predictions, verbose=True):
     if not predictions:
         raise ValueError('Prediction list is empty.')
 
-    mse_ = np.mean([float((true_r - est)**2)
-                    for (_, _, true_r, est, _) in predictions])
+    errors = np.array([true_r - est
+                       for (_, _, true_r, est, _) in predictions])
+    mse_ = np.mean(errors**2)
 
     if verbose:
         print('MSE: {0:1.4f}'.format(mse_))
@@ -114,8 +115,9 @@ def mae(predictions, verbose=True):
     if not predictions:
         raise ValueError('Prediction list is empty.')
 
-    mae_ = np.mean([float(abs(true_r - est))
-                    for (_, _, true_r, est, _) in predictions])
+    errors = np.array([true_r - est
+                       for (_, _, true_r, est, _) in predictions])
+    mae_ = np.mean(np.abs(errors))
 
     if verbose:
         print('MAE:  {0:1.4f}'.format(mae_))
@@ -155,13 +157,17 @@ def fcp(predictions, verbose=True):
     for u0, _, r0, est, _ in predictions:
         predictions_u[u0].append((r0, est))
 
+    # concordant and discordant pairs are counted with broadcast comparisons
+    # over all (i, j) pairs at once, instead of two branchy Python loops.
     for u0, preds in iteritems(predictions_u):
-        for r0i, esti in preds:
-            for r0j, estj in preds:
-                if esti > estj and r0i > r0j:
-                    nc_u[u0] += 1
-                if esti >= estj and r0i < r0j:
-                    nd_u[u0] += 1
+        r0s = np.array([r0 for (r0, _) in preds])
+        ests = np.array([est for (_, est) in preds])
+        nc = np.count_nonzero((ests[:, None] > ests) & (r0s[:, None] > r0s))
+        nd = np.count_nonzero((ests[:, None] >= ests) & (r0s[:, None] < r0s))
+        if nc:
+            nc_u[u0] = nc
+        if nd:
+            nd_u[u0] = nd
 
     nc = np.mean(list(nc_u.values())) if nc_u else 0
     nd = np.mean(list(nd_u.values())) if nd_u else 0
@@ -7,6 +7,11 @@ inherit.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import numpy as np
+from joblib import Parallel
+from joblib import delayed
+from joblib import effective_n_jobs
+
 from .. import similarities as sims
 from .predictions import PredictionImpossible
 from .predictions import Prediction
@@ -14,6 +19,13 @@ from .optimize_baselines import baseline_als
 from .optimize_baselines import baseline_sgd
 
 
+def _predict_chunk(algo, chunk, verbose):
+    """Helper for parallel calls to test(): predict a chunk of the testset."""
+
+    return [algo.predict(uid, iid, r_ui_trans, verbose=verbose)
+            for (uid, iid, r_ui_trans) in chunk]
+
+
 class AlgoBase(object):
     """Abstract class where is defined the basic behavior of a prediction
     algorithm.
@@ -50,8 +62,9 @@ class AlgoBase(object):
 
         self.trainset = trainset
 
-        # (re) Initialise baselines
+        # (re) Initialise baselines and similarities
         self.bu = self.bi = None
+        self.sim = None
 
         return self
 
@@ -142,7 +155,7 @@ class AlgoBase(object):
 
         return self.trainset.global_mean
 
-    def test(self, testset, verbose=False):
+    def test(self, testset, verbose=False, n_jobs=1):
         """Test the algorithm on given testset, i.e. estimate all the ratings
         in the given testset.
 
@@ -153,6 +166,18 @@ class AlgoBase(object):
                 method.
             verbose(bool): Whether to print details for each predictions.
                 Default is False.
+            n_jobs(int): The maximum number of chunks of the testset predicted
+                in parallel. Predictions are independent of each other, so
+                they can be dispatched over multiple processes.
+
+                - If ``-1``, all CPUs are used.
+                - If ``1`` is given, no parallel computing code is used at\
+                    all, which is useful for debugging.
+                - For ``n_jobs`` below ``-1``, ``(n_cpus + n_jobs + 1)`` are\
+                    used.  For example, with ``n_jobs = -2`` all CPUs but one\
+                    are used.
+
+                Default is ``1``.
 
         Returns:
             A list of :class:`Prediction\
@@ -160,12 +185,27 @@ class AlgoBase(object):
             that contains all the estimated ratings.
         """
 
-        # The ratings are translated back to their original scale.
-        predictions = [self.predict(uid,
-                                    iid,
-                                    r_ui_trans,
-                                    verbose=verbose)
-                       for (uid, iid, r_ui_trans) in testset]
+        if n_jobs == 1:
+            # The ratings are translated back to their original scale.
+            predictions = [self.predict(uid,
+                                        iid,
+                                        r_ui_trans,
+                                        verbose=verbose)
+                           for (uid, iid, r_ui_trans) in testset]
+            return predictions
+
+        # Dispatch contiguous chunks of the testset (rather than single
+        # ratings, which would drown the computation in dispatch overhead)
+        # and concatenate the results in order.
+        n_procs = effective_n_jobs(n_jobs)
+        chunks = [testset[start::n_procs] for start in range(n_procs)]
+        delayed_list = (delayed(_predict_chunk)(self, chunk, verbose)
+                        for chunk in chunks)
+        out = Parallel(n_jobs=n_jobs)(delayed_list)
+
+        predictions = [None] * len(testset)
+        for start, chunk_predictions in enumerate(out):
+            predictions[start::n_procs] = chunk_predictions
         return predictions
 
     def compute_baselines(self):
@@ -218,6 +258,11 @@ class AlgoBase(object):
         Returns:
             The similarity matrix."""
 
+        # Just as for compute_baselines, return the cached matrix if this
+        # method has already been called on the same trainset.
+        if self.sim is not None:
+            return self.sim
+
         construction_func = {'cosine': sims.cosine,
                              'msd': sims.msd,
                              'pearson': sims.pearson,
@@ -246,10 +291,10 @@ class AlgoBase(object):
         try:
             if getattr(self, 'verbose', False):
                 print('Computing the {0} similarity matrix...'.format(name))
-            sim = construction_func[name](*args)
+            self.sim = construction_func[name](*args)
             if getattr(self, 'verbose', False):
                 print('Done computing similarity matrix.')
-            return sim
+            return self.sim
         except KeyError:
             raise NameError('Wrong sim name ' + name + '. Allowed values ' +
                             'are ' + ', '.join(construction_func.keys()) + '.')
@@ -276,13 +321,10 @@ class AlgoBase(object):
             to ``iid``.
         """
 
-        if self.sim_options['user_based']:
-            all_instances = self.trainset.all_users
-        else:
-            all_instances = self.trainset.all_items
-
-        others = [(x, self.sim[iid, x]) for x in all_instances() if x != iid]
-        others.sort(key=lambda tple: tple[1], reverse=True)
-        k_nearest_neighbors = [j for (j, _) in others[:k]]
+        # sort the whole similarity row at once instead of building and
+        # sorting a list of Python tuples. The stable sort keeps the same
+        # ordering as the previous implementation on ties.
+        order = np.argsort(-self.sim[iid], kind='stable')
+        k_nearest_neighbors = [int(x) for x in order[order != iid][:k]]
 
         return k_nearest_neighbors
@@ -168,14 +168,16 @@ class CoClustering(AlgoBase):
         """
 
         # Number of entities in user clusters, item clusters and co-clusters.
-        cdef np.ndarray[np.int_t] count_cltr_u
-        cdef np.ndarray[np.int_t] count_cltr_i
-        cdef np.ndarray[np.int_t, ndim=2] count_cocltr
+        # int32 is plenty for counts and sums of integer ratings, and halves
+        # the memory traffic of the accumulation loop.
+        cdef np.ndarray[np.int32_t] count_cltr_u
+        cdef np.ndarray[np.int32_t] count_cltr_i
+        cdef np.ndarray[np.int32_t, ndim=2] count_cocltr
 
         # Sum of ratings for entities in each cluster
-        cdef np.ndarray[np.int_t] sum_cltr_u
-        cdef np.ndarray[np.int_t] sum_cltr_i
-        cdef np.ndarray[np.int_t, ndim=2] sum_cocltr
+        cdef np.ndarray[np.int32_t] sum_cltr_u
+        cdef np.ndarray[np.int32_t] sum_cltr_i
+        cdef np.ndarray[np.int32_t, ndim=2] sum_cocltr
 
         # The averages of each cluster (what will be returned)
         cdef np.ndarray[np.double_t] avg_cltr_u
@@ -186,13 +188,13 @@ class CoClustering(AlgoBase):
         cdef double global_mean = self.trainset.global_mean
 
         # Initialize everything to zero
-        count_cltr_u = np.zeros(self.n_cltr_u, np.int)
-        count_cltr_i = np.zeros(self.n_cltr_i, np.int)
-        count_cocltr = np.zeros((self.n_cltr_u, self.n_cltr_i), np.int)
+        count_cltr_u = np.zeros(self.n_cltr_u, np.int32)
+        count_cltr_i = np.zeros(self.n_cltr_i, np.int32)
+        count_cocltr = np.zeros((self.n_cltr_u, self.n_cltr_i), np.int32)
 
-        sum_cltr_u = np.zeros(self.n_cltr_u, np.int)
-        sum_cltr_i = np.zeros(self.n_cltr_i, np.int)
-        sum_cocltr = np.zeros((self.n_cltr_u, self.n_cltr_i), np.int)
+        sum_cltr_u = np.zeros(self.n_cltr_u, np.int32)
+        sum_cltr_i = np.zeros(self.n_cltr_i, np.int32)
+        sum_cocltr = np.zeros((self.n_cltr_u, self.n_cltr_i), np.int32)
 
         avg_cltr_u = np.zeros(self.n_cltr_u, np.double)
         avg_cltr_i = np.zeros(self.n_cltr_i, np.double)
@@ -5,8 +5,6 @@ the :mod:`knns` module includes some k-NN inspired algorithms.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 import numpy as np
-from six import iteritems
-import heapq
 
 from .predictions import PredictionImpossible
 from .algo_base import AlgoBase
@@ -42,8 +40,29 @@ class SymmetricAlgo(AlgoBase):
         self.xr = self.trainset.ur if ub else self.trainset.ir
         self.yr = self.trainset.ir if ub else self.trainset.ur
 
+        # Flatten yr into CSR-like arrays: the xs having rated y and the
+        # associated ratings are yr_x[ptr[y]:ptr[y + 1]] and
+        # yr_r[ptr[y]:ptr[y + 1]]. Built once here so that estimate() does
+        # not have to convert lists of Python tuples for every prediction.
+        self._yr_ptr = np.zeros(self.n_y + 1, dtype=np.int64)
+        self._yr_x = np.empty(self.trainset.n_ratings, dtype=np.int64)
+        self._yr_r = np.empty(self.trainset.n_ratings, dtype=np.double)
+        p = 0
+        for y in range(self.n_y):
+            for x2, r in self.yr[y]:
+                self._yr_x[p] = x2
+                self._yr_r[p] = r
+                p += 1
+            self._yr_ptr[y + 1] = p
+
         return self
 
+    def yr_slice(self, y):
+        """Return the ratings of y as a pair of aligned arrays (xs, rs)."""
+
+        start, end = self._yr_ptr[y], self._yr_ptr[y + 1]
+        return self._yr_x[start:end], self._yr_r[start:end]
+
     def switch(self, u_stuff, i_stuff):
         """Return x_stuff and y_stuff depending on the user_based field."""
 
@@ -107,20 +126,29 @@ class KNNBasic(SymmetricAlgo):
 
         x, y = self.switch(u, i)
 
-        neighbors = [(self.sim[x, x2], r) for (x2, r) in self.yr[y]]
-        k_neighbors = heapq.nlargest(self.k, neighbors, key=lambda t: t[0])
+        x2s, ratings = self.yr_slice(y)
+        if not len(x2s):
+            raise PredictionImpossible('Not enough neighbors.')
+
+        sims = self.sim[x, x2s]
+
+        # select the k nearest neighbors. The stable descending sort selects
+        # the same neighbors as heapq.nlargest used to (first come, first
+        # served on ties), without building Python tuples.
+        top = np.argsort(-sims, kind='stable')[:self.k]
+        sims = sims[top]
+        ratings = ratings[top]
 
         # compute weighted average
-        sum_sim = sum_ratings = actual_k = 0
-        for (sim, r) in k_neighbors:
-            if sim > 0:
-                sum_sim += sim
-                sum_ratings += sim * r
-                actual_k += 1
+        positive = sims > 0
+        actual_k = int(np.count_nonzero(positive))
 
         if actual_k < self.min_k:
             raise PredictionImpossible('Not enough neighbors.')
 
+        sum_sim = np.sum(sims[positive])
+        sum_ratings = np.sum(sims[positive] * ratings[positive])
+
         est = sum_ratings / sum_sim
 
         details = {'actual_k': actual_k}
@@ -177,9 +205,11 @@ class KNNWithMeans(SymmetricAlgo):
         SymmetricAlgo.fit(self, trainset)
         self.sim = self.compute_similarities()
 
-        self.means = np.zeros(self.n_x)
-        for x, ratings in iteritems(self.xr):
-            self.means[x] = np.mean([r for (_, r) in ratings])
+        # mean rating of each x, computed with two groupby-sum passes over
+        # the flat rating arrays instead of one np.mean call per x.
+        sums = np.bincount(self._yr_x, weights=self._yr_r, minlength=self.n_x)
+        counts = np.bincount(self._yr_x, minlength=self.n_x)
+        self.means = sums / counts
 
         return self
 
@@ -190,26 +220,30 @@ class KNNWithMeans(SymmetricAlgo):
 
         x, y = self.switch(u, i)
 
-        neighbors = [(x2, self.sim[x, x2], r) for (x2, r) in self.yr[y]]
-        k_neighbors = heapq.nlargest(self.k, neighbors, key=lambda t: t[1])
-
         est = self.means[x]
 
-        # compute weighted average
-        sum_sim = sum_ratings = actual_k = 0
-        for (nb, sim, r) in k_neighbors:
-            if sim > 0:
-                sum_sim += sim
-                sum_ratings += sim * (r - self.means[nb])
-                actual_k += 1
-
-        if actual_k < self.min_k:
-            sum_ratings = 0
-
-        try:
-            est += sum_ratings / sum_sim
-        except ZeroDivisionError:
-            pass  # return mean
+        actual_k = 0
+        x2s, ratings = self.yr_slice(y)
+        if len(x2s):
+            sims = self.sim[x, x2s]
+
+            # select the k nearest neighbors (see note in KNNBasic.estimate)
+            top = np.argsort(-sims, kind='stable')[:self.k]
+            sims = sims[top]
+            x2s = x2s[top]
+            ratings = ratings[top]
+
+            # compute weighted average of the mean-centered ratings
+            positive = sims > 0
+            actual_k = int(np.count_nonzero(positive))
+
+            if actual_k >= self.min_k:
+                sum_sim = np.sum(sims[positive])
+                sum_ratings = np.sum(sims[positive] * (ratings[positive] -
+                                     self.means[x2s[positive]]))
+                if sum_sim > 0:
+                    est += sum_ratings / sum_sim
+                # else: return mean
 
         details = {'actual_k': actual_k}
         return est, details
@@ -295,25 +329,32 @@ class KNNBaseline(SymmetricAlgo):
         if not (self.trainset.knows_user(u) and self.trainset.knows_item(i)):
             return est
 
-        neighbors = [(x2, self.sim[x, x2], r) for (x2, r) in self.yr[y]]
-        k_neighbors = heapq.nlargest(self.k, neighbors, key=lambda t: t[1])
-
-        # compute weighted average
-        sum_sim = sum_ratings = actual_k = 0
-        for (nb, sim, r) in k_neighbors:
-            if sim > 0:
-                sum_sim += sim
-                nb_bsl = self.trainset.global_mean + self.bx[nb] + self.by[y]
-                sum_ratings += sim * (r - nb_bsl)
-                actual_k += 1
-
-        if actual_k < self.min_k:
-            sum_ratings = 0
-
-        try:
-            est += sum_ratings / sum_sim
-        except ZeroDivisionError:
-            pass  # just baseline again
+        actual_k = 0
+        x2s, ratings = self.yr_slice(y)
+        if len(x2s):
+            sims = self.sim[x, x2s]
+
+            # select the k nearest neighbors (see note in KNNBasic.estimate)
+            top = np.argsort(-sims, kind='stable')[:self.k]
+            sims = sims[top]
+            x2s = x2s[top]
+            ratings = ratings[top]
+
+            # compute weighted average of the baseline-centered ratings. The
+            # neighbors baselines are computed with a single broadcast
+            # expression rather than one scalar expression per neighbor.
+            positive = sims > 0
+            actual_k = int(np.count_nonzero(positive))
+
+            if actual_k >= self.min_k:
+                nb_bsls = (self.trainset.global_mean +
+                           self.bx[x2s[positive]] + self.by[y])
+                sum_sim = np.sum(sims[positive])
+                sum_ratings = np.sum(sims[positive] *
+                                     (ratings[positive] - nb_bsls))
+                if sum_sim > 0:
+                    est += sum_ratings / sum_sim
+                # else: just baseline again
 
         details = {'actual_k': actual_k}
         return est, details
@@ -369,16 +410,19 @@ class KNNWithZScore(SymmetricAlgo):
 
         SymmetricAlgo.fit(self, trainset)
 
-        self.means = np.zeros(self.n_x)
-        self.sigmas = np.zeros(self.n_x)
         # when certain sigma is 0, use overall sigma
-        self.overall_sigma = np.std([r for (_, _, r)
-                                     in self.trainset.all_ratings()])
-
-        for x, ratings in iteritems(self.xr):
-            self.means[x] = np.mean([r for (_, r) in ratings])
-            sigma = np.std([r for (_, r) in ratings])
-            self.sigmas[x] = self.overall_sigma if sigma == 0.0 else sigma
+        self.overall_sigma = np.std(self._yr_r)
+
+        # per-x means and standard deviations, computed with groupby-sum
+        # passes over the flat rating arrays instead of one np.mean and one
+        # np.std call per x.
+        counts = np.bincount(self._yr_x, minlength=self.n_x)
+        sums = np.bincount(self._yr_x, weights=self._yr_r, minlength=self.n_x)
+        self.means = sums / counts
+        sq_devs = (self._yr_r - self.means[self._yr_x]) ** 2
+        sigmas = np.sqrt(np.bincount(self._yr_x, weights=sq_devs,
+                                     minlength=self.n_x) / counts)
+        self.sigmas = np.where(sigmas == 0.0, self.overall_sigma, sigmas)
 
         self.sim = self.compute_similarities()
 
@@ -391,26 +435,32 @@ class KNNWithZScore(SymmetricAlgo):
 
         x, y = self.switch(u, i)
 
-        neighbors = [(x2, self.sim[x, x2], r) for (x2, r) in self.yr[y]]
-        k_neighbors = heapq.nlargest(self.k, neighbors, key=lambda t: t[1])
-
         est = self.means[x]
 
-        # compute weighted average
-        sum_sim = sum_ratings = actual_k = 0
-        for (nb, sim, r) in k_neighbors:
-            if sim > 0:
-                sum_sim += sim
-                sum_ratings += sim * (r - self.means[nb]) / self.sigmas[nb]
-                actual_k += 1
-
-        if actual_k < self.min_k:
-            sum_ratings = 0
-
-        try:
-            est += sum_ratings / sum_sim * self.sigmas[x]
-        except ZeroDivisionError:
-            pass  # return mean
+        actual_k = 0
+        x2s, ratings = self.yr_slice(y)
+        if len(x2s):
+            sims = self.sim[x, x2s]
+
+            # select the k nearest neighbors (see note in KNNBasic.estimate)
+            top = np.argsort(-sims, kind='stable')[:self.k]
+            sims = sims[top]
+            x2s = x2s[top]
+            ratings = ratings[top]
+
+            # compute weighted average of the z-scores
+            positive = sims > 0
+            actual_k = int(np.count_nonzero(positive))
+
+            if actual_k >= self.min_k:
+                x2s = x2s[positive]
+                sum_sim = np.sum(sims[positive])
+                sum_ratings = np.sum(sims[positive] *
+                                     (ratings[positive] - self.means[x2s]) /
+                                     self.sigmas[x2s])
+                if sum_sim > 0:
+                    est += sum_ratings / sum_sim * self.sigmas[x]
+                # else: return mean
 
         details = {'actual_k': actual_k}
         return est, details
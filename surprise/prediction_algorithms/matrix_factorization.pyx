@@ -199,7 +199,13 @@ class SVD(AlgoBase):
         # item factors
         cdef np.ndarray[np.double_t, ndim=2] qi
 
-        cdef int u, i, f
+        # all ratings, stored once as flat typed arrays
+        cdef np.ndarray[np.int_t] users
+        cdef np.ndarray[np.int_t] items
+        cdef np.ndarray[np.double_t] ratings
+
+        cdef int u, i, f, k
+        cdef int n_ratings = trainset.n_ratings
         cdef double r, err, dot, puf, qif
         cdef double global_mean = self.trainset.global_mean
 
@@ -225,10 +231,23 @@ class SVD(AlgoBase):
         if not self.biased:
             global_mean = 0
 
+        # Flatten the ratings into typed arrays once, rather than going
+        # through the all_ratings() generator at every epoch.
+        users = np.empty(n_ratings, np.int_)
+        items = np.empty(n_ratings, np.int_)
+        ratings = np.empty(n_ratings, np.double)
+        for k, (u, i, r) in enumerate(trainset.all_ratings()):
+            users[k] = u
+            items[k] = i
+            ratings[k] = r
+
         for current_epoch in range(self.n_epochs):
             if self.verbose:
                 print("Processing epoch {}".format(current_epoch))
-            for u, i, r in trainset.all_ratings():
+            for k in range(n_ratings):
+                u = users[k]
+                i = items[k]
+                r = ratings[k]
 
                 # compute current error
                 dot = 0  # <q_i, p_u>
@@ -411,7 +430,19 @@ class SVDpp(AlgoBase):
         # item implicit factors
         cdef np.ndarray[np.double_t, ndim=2] yj
 
-        cdef int u, i, j, f
+        # items rated by each user, stored once as CSR-like flat arrays:
+        # items rated by u are ur_j[ur_ptr[u]:ur_ptr[u + 1]]
+        cdef np.ndarray[np.int_t] ur_ptr
+        cdef np.ndarray[np.int_t] ur_j
+        cdef np.ndarray[np.double_t] sqrt_Iu_all
+
+        # all ratings, stored once as flat typed arrays
+        cdef np.ndarray[np.int_t] users
+        cdef np.ndarray[np.int_t] items
+        cdef np.ndarray[np.double_t] ratings
+
+        cdef int u, i, j, f, p, k, start, end
+        cdef int n_ratings = trainset.n_ratings
         cdef double r, err, dot, puf, qif, sqrt_Iu, _
         cdef double global_mean = self.trainset.global_mean
         cdef np.ndarray[np.double_t] u_impl_fdb
@@ -441,18 +472,47 @@ class SVDpp(AlgoBase):
                         (trainset.n_items, self.n_factors))
         u_impl_fdb = np.zeros(self.n_factors, np.double)
 
+        # Build the CSR arrays of the items rated by each user once, instead
+        # of rebuilding a Python list per rating per epoch (which was COSTLY).
+        # |I_u| ** -0.5 is also precomputed, once per user.
+        ur_ptr = np.zeros(trainset.n_users + 1, np.int_)
+        ur_j = np.empty(trainset.n_ratings, np.int_)
+        p = 0
+        for u in range(trainset.n_users):
+            for j, _ in trainset.ur[u]:
+                ur_j[p] = j
+                p += 1
+            ur_ptr[u + 1] = p
+        sqrt_Iu_all = np.sqrt(np.diff(ur_ptr).astype(np.double))
+
+        # Flatten the ratings into typed arrays once, rather than going
+        # through the all_ratings() generator at every epoch.
+        users = np.empty(n_ratings, np.int_)
+        items = np.empty(n_ratings, np.int_)
+        ratings = np.empty(n_ratings, np.double)
+        for k, (u, i, r) in enumerate(trainset.all_ratings()):
+            users[k] = u
+            items[k] = i
+            ratings[k] = r
+
         for current_epoch in range(self.n_epochs):
             if self.verbose:
                 print(" processing epoch {}".format(current_epoch))
-            for u, i, r in trainset.all_ratings():
+            for k in range(n_ratings):
+                u = users[k]
+                i = items[k]
+                r = ratings[k]
 
-                # items rated by u. This is COSTLY
-                Iu = [j for (j, _) in trainset.ur[u]]
-                sqrt_Iu = np.sqrt(len(Iu))
+                # items rated by u are ur_j[start:end]
+                start = ur_ptr[u]
+                end = ur_ptr[u + 1]
+                sqrt_Iu = sqrt_Iu_all[u]
 
                 # compute user implicit feedback
-                u_impl_fdb = np.zeros(self.n_factors, np.double)
-                for j in Iu:
+                for f in range(self.n_factors):
+                    u_impl_fdb[f] = 0
+                for p in range(start, end):
+                    j = ur_j[p]
                     for f in range(self.n_factors):
                         u_impl_fdb[f] += yj[j, f] / sqrt_Iu
 
@@ -474,7 +534,8 @@ class SVDpp(AlgoBase):
                     pu[u, f] += lr_pu * (err * qif - reg_pu * puf)
                     qi[i, f] += lr_qi * (err * (puf + u_impl_fdb[f]) -
                                          reg_qi * qif)
-                    for j in Iu:
+                    for p in range(start, end):
+                        j = ur_j[p]
                         yj[j, f] += lr_yj * (err * qif / sqrt_Iu -
                                              reg_yj * yj[j, f])
 
@@ -640,7 +701,13 @@ class NMF(AlgoBase):
         cdef np.ndarray[np.double_t, ndim=2] item_num
         cdef np.ndarray[np.double_t, ndim=2] item_denom
 
-        cdef int u, i, f
+        # all ratings, stored once as flat typed arrays
+        cdef np.ndarray[np.int_t] users
+        cdef np.ndarray[np.int_t] items
+        cdef np.ndarray[np.double_t] ratings
+
+        cdef int u, i, f, k
+        cdef int n_all_ratings = trainset.n_ratings
         cdef double r, est, l, dot, err
         cdef double reg_pu = self.reg_pu
         cdef double reg_qi = self.reg_qi
@@ -663,6 +730,16 @@ class NMF(AlgoBase):
         if not self.biased:
             global_mean = 0
 
+        # Flatten the ratings into typed arrays once, rather than going
+        # through the all_ratings() generator at every epoch.
+        users = np.empty(n_all_ratings, np.int_)
+        items = np.empty(n_all_ratings, np.int_)
+        ratings = np.empty(n_all_ratings, np.double)
+        for k, (u, i, r) in enumerate(trainset.all_ratings()):
+            users[k] = u
+            items[k] = i
+            ratings[k] = r
+
         for current_epoch in range(self.n_epochs):
 
             if self.verbose:
@@ -675,7 +752,10 @@ class NMF(AlgoBase):
             item_denom = np.zeros((trainset.n_items, self.n_factors))
 
             # Compute numerators and denominators for users and items factors
-            for u, i, r in trainset.all_ratings():
+            for k in range(n_all_ratings):
+                u = users[k]
+                i = items[k]
+                r = ratings[k]
 
                 # compute current estimation and error
                 dot = 0  # <q_i, p_u>
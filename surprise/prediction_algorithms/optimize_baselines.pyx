@@ -29,27 +29,53 @@ def baseline_als(self):
     cdef np.ndarray[np.double_t] bu = np.zeros(self.trainset.n_users)
     cdef np.ndarray[np.double_t] bi = np.zeros(self.trainset.n_items)
 
-    cdef int u, i
-    cdef double r, err, dev_i, dev_u
+    cdef int u, i, k
+    cdef double r
     cdef double global_mean = self.trainset.global_mean
+    cdef int n_users = self.trainset.n_users
+    cdef int n_items = self.trainset.n_items
+    cdef int n_ratings = self.trainset.n_ratings
 
     cdef int n_epochs = self.bsl_options.get('n_epochs', 10)
     cdef double reg_u = self.bsl_options.get('reg_u', 15)
     cdef double reg_i = self.bsl_options.get('reg_i', 10)
 
-    for dummy in range(n_epochs):
-        for i in self.trainset.all_items():
-            dev_i = 0
-            for (u, r) in self.trainset.ir[i]:
-                dev_i += r - global_mean - bu[u]
-
-            bi[i] = dev_i / (reg_i + len(self.trainset.ir[i]))
+    # The per-item and per-user deviation sums are groupby-sums, which
+    # np.bincount computes in one C pass. The ratings are flattened once in
+    # item-major and user-major order, so that each bin accumulates its terms
+    # in the same order as the original Python loops.
+    users_i = np.empty(n_ratings, np.int_)
+    items_i = np.empty(n_ratings, np.int_)
+    ratings_i = np.empty(n_ratings, np.double)
+    k = 0
+    for i in self.trainset.all_items():
+        for (u, r) in self.trainset.ir[i]:
+            users_i[k] = u
+            items_i[k] = i
+            ratings_i[k] = r
+            k += 1
+
+    users_u = np.empty(n_ratings, np.int_)
+    items_u = np.empty(n_ratings, np.int_)
+    ratings_u = np.empty(n_ratings, np.double)
+    k = 0
+    for u in self.trainset.all_users():
+        for (i, r) in self.trainset.ur[u]:
+            users_u[k] = u
+            items_u[k] = i
+            ratings_u[k] = r
+            k += 1
+
+    denom_i = reg_i + np.bincount(items_i, minlength=n_items)
+    denom_u = reg_u + np.bincount(users_u, minlength=n_users)
 
-        for u in self.trainset.all_users():
-            dev_u = 0
-            for (i, r) in self.trainset.ur[u]:
-                dev_u += r - global_mean - bi[i]
-            bu[u] = dev_u / (reg_u + len(self.trainset.ur[u]))
+    for dummy in range(n_epochs):
+        bi = np.bincount(items_i,
+                         weights=ratings_i - global_mean - bu[users_i],
+                         minlength=n_items) / denom_i
+        bu = np.bincount(users_u,
+                         weights=ratings_u - global_mean - bi[items_u],
+                         minlength=n_users) / denom_u
 
     return bu, bi
 
@@ -67,16 +93,35 @@ def baseline_sgd(self):
     cdef np.ndarray[np.double_t] bu = np.zeros(self.trainset.n_users)
     cdef np.ndarray[np.double_t] bi = np.zeros(self.trainset.n_items)
 
-    cdef int u, i
+    cdef np.ndarray[np.int_t] users
+    cdef np.ndarray[np.int_t] items
+    cdef np.ndarray[np.double_t] ratings
+
+    cdef int u, i, k
     cdef double r, err
     cdef double global_mean = self.trainset.global_mean
+    cdef int n_ratings = self.trainset.n_ratings
 
     cdef int n_epochs = self.bsl_options.get('n_epochs', 20)
     cdef double reg = self.bsl_options.get('reg', 0.02)
     cdef double lr = self.bsl_options.get('learning_rate', 0.005)
 
+    # Flatten the ratings into typed arrays once, so that the epoch loop
+    # below only deals with C integers and doubles instead of going through
+    # the all_ratings() generator at every epoch.
+    users = np.empty(n_ratings, np.int_)
+    items = np.empty(n_ratings, np.int_)
+    ratings = np.empty(n_ratings, np.double)
+    for k, (u, i, r) in enumerate(self.trainset.all_ratings()):
+        users[k] = u
+        items[k] = i
+        ratings[k] = r
+
     for dummy in range(n_epochs):
-        for u, i, r in self.trainset.all_ratings():
+        for k in range(n_ratings):
+            u = users[k]
+            i = items[k]
+            r = ratings[k]
             err = (r - (global_mean + bu[u] + bi[i]))
             bu[u] += lr * (err - reg * bu[u])
             bi[i] += lr * (err - reg * bi[i])
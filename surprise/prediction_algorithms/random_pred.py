@@ -33,8 +33,9 @@ class NormalPredictor(AlgoBase):
 
         AlgoBase.fit(self, trainset)
 
-        num = sum((r - self.trainset.global_mean)**2
-                  for (_, _, r) in self.trainset.all_ratings())
+        ratings = np.fromiter((r for (_, _, r) in self.trainset.all_ratings()),
+                              np.double, count=self.trainset.n_ratings)
+        num = np.sum((ratings - self.trainset.global_mean)**2)
         denum = self.trainset.n_ratings
         self.sigma = np.sqrt(num / denum)
 
@@ -46,7 +46,7 @@ class SlopeOne(AlgoBase):
         n_items = trainset.n_items
 
         # Number of users having rated items i and j: |U_ij|
-        cdef np.ndarray[np.int_t, ndim=2] freq
+        cdef np.ndarray[np.int32_t, ndim=2] freq
         # Deviation from item i to item j: mean(r_ui - r_uj for u in U_ij)
         cdef np.ndarray[np.double_t, ndim=2] dev
 
@@ -54,7 +54,7 @@ class SlopeOne(AlgoBase):
 
         AlgoBase.fit(self, trainset)
 
-        freq = np.zeros((trainset.n_items, trainset.n_items), np.int)
+        freq = np.zeros((trainset.n_items, trainset.n_items), np.int32)
         dev = np.zeros((trainset.n_items, trainset.n_items), np.double)
 
         # Computation of freq and dev arrays.
@@ -77,6 +77,11 @@ class SlopeOne(AlgoBase):
         self.user_mean = [np.mean([r for (_, r) in trainset.ur[u]])
                           for u in trainset.all_users()]
 
+        # items rated by each user, stored once as an index array so that
+        # estimate() can filter the relevant items with a single mask.
+        self.u_items = [np.array([j for (j, _) in trainset.ur[u]], np.int_)
+                        for u in trainset.all_users()]
+
         return self
 
     def estimate(self, u, i):
@@ -87,9 +92,10 @@ class SlopeOne(AlgoBase):
         # Ri: relevant items for i. This is the set of items j rated by u that
         # also have common users with i (i.e. at least one user has rated both
         # i and j).
-        Ri = [j for (j, _) in self.trainset.ur[u] if self.freq[i, j] > 0]
+        js = self.u_items[u]
+        Ri = js[self.freq[i, js] > 0]
         est = self.user_mean[u]
-        if Ri:
-            est += sum(self.dev[i, j] for j in Ri) / len(Ri)
+        if Ri.size:
+            est += np.sum(self.dev[i, Ri]) / Ri.size
 
         return est
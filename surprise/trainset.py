@@ -224,12 +224,18 @@ class Trainset:
         """
         fill = self.global_mean if fill is None else float(fill)
 
+        # raw item ids are translated once, and the rated items of each user
+        # are filtered out with a boolean mask instead of one set-membership
+        # test per (user, item) pair.
+        raw_iids = [self.to_raw_iid(i) for i in self.all_items()]
+
         anti_testset = []
         for u in self.all_users():
-            user_items = set([j for (j, _) in self.ur[u]])
-            anti_testset += [(self.to_raw_uid(u), self.to_raw_iid(i), fill) for
-                             i in self.all_items() if
-                             i not in user_items]
+            raw_uid = self.to_raw_uid(u)
+            rated = np.zeros(self.n_items, dtype=bool)
+            rated[[j for (j, _) in self.ur[u]]] = True
+            anti_testset += [(raw_uid, raw_iids[i], fill) for
+                             i in np.flatnonzero(~rated)]
         return anti_testset
 
     def all_users(self):
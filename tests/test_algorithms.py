@@ -95,7 +95,7 @@ def test_sanity_checks(u1_ml100k, pkf):
         KNNBasic: 1.1337265249554591,
         KNNWithMeans: 1.1043129441881696,
         KNNBaseline: 1.0700718041752253,
-        KNNWithZScore: 1.11179436167853,
+        KNNWithZScore: 1.1117943616785297,
         SVD: 1.0077323320656948,
         SVDpp: 1.00284553561452,
         NMF: 1.0865370266372372,